@@ -1,20 +1,110 @@
 import random
 from enum import Enum, IntEnum
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cache
 
 class Symbol(IntEnum):
     X = 0
     O = 1
 
+# Opponent of each symbol, indexed by symbol
+_OPPONENT = (Symbol.O, Symbol.X)
+
 class Difficulty(Enum):
     EASY = 1
     MEDIUM = 2
     HARD = 3
 
-type Board = list[list[int | None]]
+# Cells are numbered 0-8 row-major; cell r * 3 + c is bit r * 3 + c of a player's 9-bit mask
+FULL = 0b111111111
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000, # rows
+    0b001001001, 0b010010010, 0b100100100, # cols
+    0b100010001, 0b001010100,              # diagonals
+)
+
+# Win masks passing through each cell: 2 to 4 lines, so a move is checked in O(1)
+CELL_LINES = tuple(tuple(mask for mask in WIN_MASKS if mask >> cell & 1) for cell in range(9))
+
+# Center, corners, then edges: strongest moves first, so ties prefer them
+CENTER = 4
+CORNERS = (0, 2, 6, 8)
+MOVE_ORDER = (CENTER, *CORNERS, 1, 3, 5, 7)
+
+# Empty cells of every 9-bit empty mask in MOVE_ORDER, so move loops allocate nothing
+ORDERED_MOVES = tuple(
+    tuple(cell for cell in MOVE_ORDER if empty >> cell & 1) for empty in range(FULL + 1)
+)
+
+def _symmetry_perms() -> tuple[tuple[int, ...], ...]:
+    """The 8 board symmetries as cell permutations: 4 rotations, each with and without a mirror"""
+    rotate = tuple(c * 3 + 2 - r for r in range(3) for c in range(3)) # (r, c) -> (c, 2 - r)
+    mirror = tuple(r * 3 + 2 - c for r in range(3) for c in range(3)) # (r, c) -> (r, 2 - c)
+
+    perms = []
+    perm = tuple(range(9))
+    for _ in range(4):
+        perms += [perm, tuple(mirror[cell] for cell in perm)]
+        perm = tuple(rotate[cell] for cell in perm)
+    return tuple(perms)
+
+# SYM_PERMS[s][cell] is the image of cell under symmetry s, INVERSE_PERMS maps it back
+SYM_PERMS = _symmetry_perms()
+INVERSE_PERMS = tuple(tuple(perm.index(cell) for cell in range(9)) for perm in SYM_PERMS)
+# SYM_TABLES[s][bits] is the 9-bit mask bits with every cell moved by symmetry s
+SYM_TABLES = tuple(
+    tuple(sum(1 << perm[cell] for cell in range(9) if bits >> cell & 1) for bits in range(FULL + 1))
+    for perm in SYM_PERMS
+)
+
+def canonical(a_bits: int, b_bits: int) -> tuple[int, int]:
+    """Smallest symmetric image of a position, packed as a_bits << 9 | b_bits, and its symmetry"""
+    return min((table[a_bits] << 9 | table[b_bits], sym) for sym, table in enumerate(SYM_TABLES))
+
+# Board.cells() byte values to display characters
+_DISPLAY = bytes.maketrans(b"\x00\x01\x02", b".XO")
+
+@dataclass(slots=True)
+class Board:
+    """Bitboard: one 9-bit mask of occupied cells per player"""
+    x_bits: int = 0
+    o_bits: int = 0
+
+    @property
+    def empty(self) -> int:
+        """Mask of unoccupied cells"""
+        return ~(self.x_bits | self.o_bits) & FULL
+
+    def bits(self, symbol: Symbol) -> int:
+        """Return the cell mask of symbol"""
+        return self.x_bits if symbol == Symbol.X else self.o_bits
+
+    def cell(self, row: int, col: int) -> Symbol | None:
+        """Return the symbol at (row, col), or None if empty"""
+        bit = 1 << (row * 3 + col)
+        if self.x_bits & bit:
+            return Symbol.X
+        if self.o_bits & bit:
+            return Symbol.O
+        return None
+
+    def place(self, row: int, col: int, symbol: Symbol) -> None:
+        """Mark (row, col) for symbol"""
+        bit = 1 << (row * 3 + col)
+        if symbol == Symbol.X:
+            self.x_bits |= bit
+        else:
+            self.o_bits |= bit
+
+    def cells(self) -> bytearray:
+        """Flat row-major copy of the board: 0 empty, 1 X, 2 O"""
+        x_bits, o_bits = self.x_bits, self.o_bits
+        return bytearray((x_bits >> i & 1) | (o_bits >> i & 1) << 1 for i in range(9))
 
 class Player(ABC):
     """Abstract base class for players"""
+    __slots__ = ()
 
     @abstractmethod
     def get_move(self, board: Board) -> tuple[int, int]:
@@ -23,6 +113,7 @@ class Player(ABC):
 
 class Human(Player):
     """Human player"""
+    __slots__ = ("symbol",)
 
     def __init__(self, symbol: Symbol) -> None:
         self.symbol = symbol
@@ -34,7 +125,7 @@ class Human(Player):
                 row = int(input("Enter row (0-2): "))
                 col = int(input("Enter col (0-2): "))
 
-                if 0 <= row <= 2 and 0 <= col <= 2 and board[row][col] is None:
+                if 0 <= row <= 2 and 0 <= col <= 2 and board.cell(row, col) is None:
                     return (row, col)
 
                 print("Invalid move. Try again.")
@@ -43,19 +134,25 @@ class Human(Player):
 
 class Bot(Player):
     """Bot player with configurable difficulty"""
+    __slots__ = ("difficulty", "symbol", "_rng", "opponent", "minimax")
 
-    def __init__(self, difficulty: Difficulty, symbol: Symbol = Symbol.O) -> None:
+    def __init__(self, difficulty: Difficulty, symbol: Symbol = Symbol.O, seed: int | None = None) -> None:
         self.difficulty = difficulty
         self.symbol = symbol
-        self.opponent = Symbol(1 - symbol)
+        self._rng = random.Random(seed) # Per-bot generator, so seeded games are reproducible
+        self.opponent = _OPPONENT[symbol]
         self.minimax = Minimax(bot=symbol) if difficulty == Difficulty.HARD else None
 
     def get_move(self, board: Board) -> tuple[int, int]:
         """Selects move based on difficulty level"""
+        return divmod(self._choose_cell(board), 3)
+
+    def _choose_cell(self, board: Board) -> int:
+        """Selects a cell index based on difficulty level"""
         valid_moves = Minimax.valid_moves(board)
 
         if self.difficulty == Difficulty.EASY:
-            return random.choice(valid_moves)
+            return self._rng.choice(valid_moves)
 
         if self.difficulty == Difficulty.MEDIUM:
             return self._medium_strategy(board, valid_moves)
@@ -63,141 +160,162 @@ class Bot(Player):
         # Difficulty.HARD
         return self.minimax.best_move(board)
     
-    def _medium_strategy(self, board: Board, valid_moves: list[tuple[int, int]]) -> tuple[int, int]:
+    def _medium_strategy(self, board: Board, valid_moves: list[int]) -> int:
         """Medium difficulty: win/block or prefer center/corners"""
-        # Try to win
-        if win_move := self._find_winning_move(board, valid_moves, self.symbol):
-            return win_move
-        
-        # Block opponent
-        if block_move := self._find_winning_move(board, valid_moves, self.opponent):
-            return block_move
+        # Try to win, else block opponent
+        move = self._find_win_or_block(board.bits(self.symbol), board.bits(self.opponent))
+        if move is not None:
+            return move
 
         # Prefer center
-        if (1, 1) in valid_moves:
-            return (1, 1)
+        if CENTER in valid_moves:
+            return CENTER
 
         # Prefer corners
-        corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-        valid_corners = [move for move in valid_moves if move in corners]
+        valid_corners = [move for move in valid_moves if move in CORNERS]
         if valid_corners:
-            return random.choice(valid_corners)
+            return self._rng.choice(valid_corners)
         
         # Fallback: random move
-        return random.choice(valid_moves)
-
-    def _find_winning_move(
-            self, 
-            board: Board, 
-            valid_moves: list[tuple[int, int]], 
-            symbol: int,
-        ) -> tuple[int, int] | None:
-        """Find move that wins for symbol, if one exists"""
-        for r, c in valid_moves:
-            board[r][c] = symbol
-            is_win = Minimax.is_winner(board, symbol)
-            board[r][c] = None
-
-            if is_win:
-                return (r, c)
+        return self._rng.choice(valid_moves)
+
+    @staticmethod
+    def _find_win_or_block(my_bits: int, opp_bits: int) -> int | None:
+        """Find move completing a line of my_bits, else one blocking a line of opp_bits"""
+        block_move = None
+        for mask in WIN_MASKS:
+            mine = (my_bits & mask).bit_count()
+            theirs = (opp_bits & mask).bit_count()
+
+            if mine == 2 and theirs == 0:
+                return (mask & ~my_bits).bit_length() - 1 # A win beats any block
+            if theirs == 2 and mine == 0 and block_move is None:
+                block_move = (mask & ~opp_bits).bit_length() - 1
         
-        return None
+        return block_move
 
 class Minimax:
     """Minimax algorithm for tic-tac-toe"""
+    __slots__ = ("bot",)
+
     # Class constants for scoring
     WIN = 1
     DRAW = 0
     LOSS = -1
+    # Int sentinel just below the score range, so no comparison mixes in floats
+    NEG_INF = LOSS - 1
 
     def __init__(self, bot: Symbol = Symbol.O) -> None:
         self.bot = bot
-        self.human = Symbol(1 - bot)
 
     @staticmethod
-    def valid_moves(board: Board) -> list[tuple[int, int]]:
-        """Return list of available positions on board"""
-        return [(r, c) for r in range(3) for c in range(3) if board[r][c] is None]
+    def valid_moves(board: Board) -> list[int]:
+        """Return list of available cells on board, strongest first"""
+        return list(ORDERED_MOVES[board.empty])
 
     @staticmethod
-    def is_winner(board: Board, player: int) -> bool:
-        """Return True if player has 3 cells in a row"""
-        return (
-            any(all(cell == player for cell in row) for row in board) 
-            or any(all(row[c] == player for row in board) for c in range(3)) 
-            or all(board[i][i] == player for i in range(3)) 
-            or all(board[i][2 - i] == player for i in range(3))
-        )
+    def wins_at(bits: int, cell: int) -> bool:
+        """Return True if the cell mask bits has 3 cells in a row through cell"""
+        return any(bits & mask == mask for mask in CELL_LINES[cell])
     
-    def best_move(self, board: Board) -> tuple[int, int]:
-        """Find the best move for the bot using minimax algorithm"""
-        best_score = float("-inf")
-        best_move = None
-        alpha = float("-inf")
-        beta = float("inf")
-
-        for r, c in self.valid_moves(board):
-            board[r][c] = self.bot
-            score = self.minimax(board, self.human, alpha, beta)
-            board[r][c] = None
-
-            if score > best_score:
-                best_score = score
-                best_move = (r, c)
-            
-            # Alpha-beta pruning
-            alpha = max(alpha, best_score)
-            if beta <= alpha:
-                break
-        
-        if best_move is None:
+    def best_move(self, board: Board) -> int:
+        """Find the best cell for the bot, searching only if it is not in POLICY"""
+        position, sym = canonical(board.x_bits, board.o_bits)
+        if (move := POLICY.get((position, self.bot))) is None:
+            move = _best_cell(position >> 9, position & FULL, self.bot)
+
+        if move is None:
             raise ValueError("best_move called on a full board")
         
-        return best_move
-
-    def minimax(self, board: Board, player: int, alpha: float, beta: float) -> int:
-        """Minimax algorithm"""
-        # Terminal states
-        if self.is_winner(board, self.bot):
-            return self.WIN
-        if self.is_winner(board, self.human):
-            return self.LOSS
-        
-        moves = self.valid_moves(board)
-        if not moves:
-            return self.DRAW
-        
-        # Bot's turn: maximize score
-        if player == self.bot:
-            best_score = float("-inf")
-            for r, c in moves:
-                board[r][c] = self.bot
-                score = self.minimax(board, self.human, alpha, beta)
-                board[r][c] = None
-
-                best_score = max(best_score, score)
-                alpha = max(alpha, best_score)
-                if beta <= alpha: # Alpha-beta pruning
-                    break
-        # Human's turn: minimize score
-        else:
-            best_score = float("inf")
-            for r, c in moves:
-                board[r][c] = self.human
-                score = self.minimax(board, self.bot, alpha, beta)
-                board[r][c] = None
-
-                best_score = min(best_score, score)
-                beta = min(beta, best_score)
-                if beta <= alpha: # Alpha-beta pruning
-                    break
-        return int(best_score)
+        return INVERSE_PERMS[sym][move]
+
+@cache
+def _minimax(x_bits: int, o_bits: int, player: int) -> int:
+    """Negamax value of a canonical position for player to move
+
+    Pure on its int arguments, so memoising it covers the whole game tree
+    and alpha-beta pruning is not needed.
+    """
+    moves = ORDERED_MOVES[~(x_bits | o_bits) & FULL]
+    if not moves:
+        return Minimax.DRAW
+    if _winning_cell(x_bits, o_bits, player, moves) is not None:
+        return Minimax.WIN
+
+    return max(_move_value(x_bits, o_bits, player, cell) for cell in moves)
+
+def _winning_cell(x_bits: int, o_bits: int, player: int, moves: tuple[int, ...]) -> int | None:
+    """First of moves that completes a line for player, found before any recursion"""
+    own = x_bits if player == Symbol.X else o_bits
+    for cell in moves:
+        if Minimax.wins_at(own | 1 << cell, cell):
+            return cell
+
+    return None
+
+def _move_value(x_bits: int, o_bits: int, player: int, cell: int) -> int:
+    """Value for player of playing cell, which must not complete a line: minus the reply"""
+    if player == Symbol.X:
+        x_bits |= 1 << cell
+    else:
+        o_bits |= 1 << cell
+
+    # Canonical child, so all 8 symmetric images share one cache entry
+    position, _ = canonical(x_bits, o_bits)
+    return -_minimax(position >> 9, position & FULL, _OPPONENT[player])
+
+def _best_cell(x_bits: int, o_bits: int, player: int) -> int | None:
+    """Optimal cell for player to move, ties going to the earliest in MOVE_ORDER"""
+    moves = ORDERED_MOVES[~(x_bits | o_bits) & FULL]
+    if (cell := _winning_cell(x_bits, o_bits, player, moves)) is not None:
+        return cell
+
+    best_score = Minimax.NEG_INF
+    best_cell = None
+    for cell in moves:
+        score = _move_value(x_bits, o_bits, player, cell)
+        if score > best_score:
+            best_score = score
+            best_cell = cell
+
+    return best_cell
+
+def _build_policy() -> dict[tuple[int, int], int]:
+    """Visit every reachable canonical position once, recording the optimal move for the side to move"""
+    policy: dict[tuple[int, int], int] = {}
+
+    def visit(x_bits: int, o_bits: int, player: int) -> None:
+        """Record the canonical position x_bits, o_bits and everything reachable from it"""
+        key = (x_bits << 9 | o_bits, player)
+        if key in policy or (cell := _best_cell(x_bits, o_bits, player)) is None:
+            return
+        policy[key] = cell
+
+        for cell in ORDERED_MOVES[~(x_bits | o_bits) & FULL]:
+            bit = 1 << cell
+            # A winning move ends the game, so there is nothing to record after it
+            if player == Symbol.X:
+                if not Minimax.wins_at(x_bits | bit, cell):
+                    position, _ = canonical(x_bits | bit, o_bits)
+                    visit(position >> 9, position & FULL, Symbol.O)
+            elif not Minimax.wins_at(o_bits | bit, cell):
+                position, _ = canonical(x_bits, o_bits | bit)
+                visit(position >> 9, position & FULL, Symbol.X)
+
+    for starter in Symbol:
+        visit(0, 0, starter)
+    return policy
+
+# Optimal HARD cell for every reachable (canonical x_bits << 9 | o_bits, player to move),
+# given in the canonical frame
+POLICY = _build_policy()
 
 class Game:
     """Tic-Tac-Toe game manager"""
+    __slots__ = ("board", "players", "current", "game_over", "winner", "moves")
 
     def __init__(self, player_x: Player, player_o: Player, starting_player: Symbol = Symbol.X) -> None:
-        self.board: Board = [[None for _ in range(3)] for _ in range(3)]
+        self.board = Board()
         self.players = {Symbol.X: player_x, Symbol.O: player_o}
         self.current = starting_player
         self.game_over = False
@@ -206,19 +324,19 @@ class Game:
     
     def move(self, row: int, col: int) -> bool:
         """Make a move on the board"""
-        if not (0 <= row <= 2 and 0 <= col <= 2) or self.board[row][col] is not None:
+        if not (0 <= row <= 2 and 0 <= col <= 2) or self.board.cell(row, col) is not None:
             return False
         
-        self.board[row][col] = self.current
+        self.board.place(row, col, self.current)
         self.moves += 1
 
-        if Minimax.is_winner(self.board, self.current):
+        if Minimax.wins_at(self.board.bits(self.current), row * 3 + col):
             self.winner = self.current
             self.game_over = True
         elif self.moves == 9:
             self.game_over = True
         else:
-            self.current = Symbol(1 - self.current)
+            self.current = _OPPONENT[self.current]
         
         return True
     
@@ -241,13 +359,40 @@ class Game:
     
     def display_board(self) -> None: 
         """Display current state of board"""
-        symbols = {None: ".", Symbol.X: "X", Symbol.O: "O"}
+        text = self.board.cells().translate(_DISPLAY).decode()
 
-        for i, row in enumerate(self.board):
-            print(" | ".join(symbols[cell] for cell in row))
-            if i < 2:
+        for i in range(0, 9, 3):
+            print(" | ".join(text[i:i + 3]))
+            if i < 6:
                 print("--+---+--")
 
+def tally(score: dict[str, int], game: Game) -> None:
+    """Add the result of a finished game to an X/O/Draw score"""
+    if game.winner is None:
+        score["Draw"] += 1
+    else:
+        score[["X", "O"][game.winner]] += 1
+
+def simulate_batch(n_games: int, player_x: Bot, player_o: Bot) -> dict[str, int]:
+    """Play n_games between two bots without any output, alternating the starter, and tally results"""
+    if not (isinstance(player_x, Bot) and isinstance(player_o, Bot)):
+        raise ValueError("simulate_batch plays bots only")
+    if player_x.symbol != Symbol.X or player_o.symbol != Symbol.O:
+        raise ValueError("player_x must be an X bot and player_o an O bot")
+
+    score = {"X": 0, "O": 0, "Draw": 0}
+    starter = Symbol.X
+
+    for _ in range(n_games):
+        game = Game(player_x, player_o, starting_player=starter)
+        while not game.game_over:
+            game.move(*game.players[game.current].get_move(game.board))
+
+        tally(score, game)
+        starter = _OPPONENT[starter]
+
+    return score
+
 if __name__ == "__main__":
     score = {"X": 0, "O": 0, "Draw": 0}
     current_starter = Symbol.X
@@ -290,13 +435,10 @@ if __name__ == "__main__":
         game.play()
 
         # Update score
-        if game.winner is None:
-            score["Draw"] += 1
-        else:
-            score[["X", "O"][game.winner]] += 1
+        tally(score, game)
         
         # Alternate the starting players
-        current_starter = Symbol(1 - current_starter)
+        current_starter = _OPPONENT[current_starter]
 
         # Display current score
         print(f"\nScore - X: {score["X"]}, O: {score["O"]}, Draws: {score["Draw"]}")
\ No newline at end of file